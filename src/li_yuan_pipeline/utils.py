@@ -2,8 +2,10 @@
 """Utility functions for Li Yuan Pipeline."""
 
 from datetime import date, datetime
+from functools import lru_cache
 
 
+@lru_cache(maxsize=1024)
 def ce_date_to_roc_string(ce_date: str | date | datetime, separator: str = "/") -> str:
     """
     Convert CE date to ROC date string format
@@ -22,9 +24,14 @@ def ce_date_to_roc_string(ce_date: str | date | datetime, separator: str = "/")
     str
         ROC date string in format "YYY/MM/DD" or others based on specified
         separator
+
+    Notes
+    -----
+    Results are memoized; partition boundaries repeat across assets and
+    backfills, so repeat calls skip the parse entirely.
     """
     if isinstance(ce_date, str):
-        ce_date = datetime.strptime(ce_date, "%Y-%m-%d").date()
+        ce_date = date.fromisoformat(ce_date)
     elif isinstance(ce_date, datetime):
         ce_date = ce_date.date()
 